@@ -1,19 +1,49 @@
 # backend/app.py
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify
 from flask_cors import CORS
+import json
 import os
+import random
 import sys
 
 # Add the backend directory to Python path
 sys.path.append(os.path.dirname(__file__))
 
-from hf_legal_analyzer import HFLegalAnalyzer
+from rate_limiter import RATE_LIMIT_HEADERS, client_key, init_rate_limiting
+from response_layer import init_response_layer
+from warm_start import StartupTimer, load_analyzer
+
+# Heavy modules (analyzer, model comparison) are imported on first use
+startup_timer = StartupTimer()
 
 app = Flask(__name__, template_folder='../templates')
-CORS(app)
+CORS(app, expose_headers=RATE_LIMIT_HEADERS)
+
+# Fast JSON encoding, gzip/brotli responses and precompressed templates
+template_cache = init_response_layer(app)
+
+# Largest number of texts accepted by /api/analyze/batch in one request
+MAX_BATCH_SIZE = 100
+
+def batch_request_cost():
+    """A batch costs one token per text, like sending each text separately"""
+    data = request.get_json(silent=True)
+    texts = data.get('texts') if isinstance(data, dict) else None
+    return min(len(texts), MAX_BATCH_SIZE) if isinstance(texts, list) and texts else 1
 
-# Global variable for analyzer
+# Per-client token buckets on the expensive endpoints (429 once exhausted)
+rate_limiter = init_rate_limiting(
+    app,
+    endpoints=('analyze_legal_issue', 'analyze_batch', 'compare_models'),
+    costs={'analyze_batch': batch_request_cost}
+)
+
+# Fraction of /api/analyze requests whose explanation trace is logged (0 disables)
+EXPLAIN_SAMPLE_RATE = float(os.getenv('EXPLAIN_SAMPLE_RATE', '0'))
+
+# Global variables for analyzer and model comparison
 analyzer = None
+model_comparison = None
 
 
 def initialize_analyzer():
@@ -22,18 +52,31 @@ def initialize_analyzer():
     try:
         print("🤖 Initializing Real AI Legal Analyzer...")
         
-        # Use Hugging Face AI analyzer
-        analyzer = HFLegalAnalyzer()
+        # Use Hugging Face AI analyzer, warm-started from ANALYZER_SNAPSHOT if set
+        analyzer = load_analyzer(os.getenv('ANALYZER_SNAPSHOT'), startup_timer)
         print("✅ Real AI Legal Analyzer initialized successfully!")
+        startup_timer.print_report()
         return True
         
     except Exception as e:
         print(f"❌ Error initializing AI analyzer: {e}")
         return False
 
+def get_model_comparison():
+    """Import and build the model comparison on first use"""
+    global model_comparison
+    if model_comparison is None:
+        from model_comparison import ModelComparison
+        model_comparison = ModelComparison()
+    return model_comparison
+
 @app.route('/')
 def home():
-    return render_template('index.html')
+    return template_cache.serve('index.html')
+
+@app.route('/document-generator')
+def document_generator():
+    return template_cache.serve('document-generator.html')
 
 @app.route('/api/analyze', methods=['POST'])
 def analyze_legal_issue():
@@ -43,6 +86,9 @@ def analyze_legal_issue():
     try:
         data = request.get_json()
         user_input = data.get('text', '')
+        jurisdiction = data.get('jurisdiction')
+        explain = data.get('explain') is True
+        sampled = not explain and EXPLAIN_SAMPLE_RATE > 0 and random.random() < EXPLAIN_SAMPLE_RATE
         
         if not user_input:
             return jsonify({'error': 'Please provide some text to analyze'}), 400
@@ -50,7 +96,12 @@ def analyze_legal_issue():
         print(f"🔍 AI Analyzing: {user_input[:50]}...")
         
         # Analyze with REAL AI
-        result = analyzer.analyze_with_ai(user_input)
+        result = analyzer.analyze_with_ai(user_input, jurisdiction, explain=explain or sampled)
+        
+        if sampled:
+            # Sampled traces go to the log only; the response stays unchanged
+            explanation = result.pop('explanation', None)
+            print(f"🔎 Explain trace: {json.dumps(explanation, ensure_ascii=False)}")
         
         return jsonify({
             'success': True,
@@ -61,30 +112,51 @@ def analyze_legal_issue():
     except Exception as e:
         return jsonify({'error': f'AI Analysis failed: {str(e)}'}), 500
 
+@app.route('/api/analyze/batch', methods=['POST'])
+def analyze_batch():
+    if not analyzer:
+        return jsonify({'error': 'AI Analyzer not initialized. Please try again in a moment.'}), 500
+    
+    try:
+        data = request.get_json()
+        texts = data.get('texts', [])
+        jurisdiction = data.get('jurisdiction')
+        explain = data.get('explain') is True
+        
+        if not texts or not isinstance(texts, list):
+            return jsonify({'error': 'Please provide a list of texts to analyze'}), 400
+        if len(texts) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_BATCH_SIZE} texts can be analyzed per request'}), 400
+        if not all(isinstance(text, str) and text.strip() for text in texts):
+            return jsonify({'error': 'Every item in texts must be a non-empty string'}), 400
+        
+        results = [analyzer.analyze_with_ai(text, jurisdiction, explain=explain) for text in texts]
+        
+        return jsonify({
+            'success': True,
+            'results': results
+        })
+    
+    except Exception as e:
+        return jsonify({'error': f'AI Analysis failed: {str(e)}'}), 500
+
 @app.route('/api/status', methods=['GET'])
 def status():
     return jsonify({
         'status': 'ready' if analyzer else 'initializing',
         'message': 'AI Legal analyzer is ready!' if analyzer else 'Initializing AI legal analyzer...',
-        'ai_enabled': True
+        'ai_enabled': True,
+        'startup': startup_timer.as_dict()
     })
 
-if __name__ == '__main__':
-    print("🚀 Starting Right Advisor with REAL AI...")
-    
-    # Initialize analyzer
-    if initialize_analyzer():
-        print("🌐 Starting Flask server on http://localhost:5000")
-        print("📱 AI-Powered Legal Assistant Ready!")
-        app.run(debug=True, port=5000, host='0.0.0.0')
-    else:
-        print("❌ Failed to start server - AI analyzer initialization failed")
-
-# Add to your existing app.py
-from model_comparison import ModelComparison
-
-# Initialize model comparison
-model_comparison = ModelComparison()
+@app.route('/api/usage', methods=['GET'])
+def usage():
+    return jsonify({
+        'limit_per_second': rate_limiter.rate,
+        'burst': int(rate_limiter.burst),
+        'daily_quota': rate_limiter.quota,
+        'usage': rate_limiter.usage(client_key())
+    })
 
 @app.route('/api/compare-models', methods=['POST'])
 def compare_models():
@@ -96,15 +168,25 @@ def compare_models():
             return jsonify({'error': 'Please provide text to analyze'}), 400
         
         # Run model comparison
-        comparison_result = model_comparison.compare_models(user_input)
+        comparison = get_model_comparison()
+        comparison_result = comparison.compare_models(user_input)
         
         return jsonify({
             'success': True,
             'comparison': comparison_result,
-            'model_stats': model_comparison.get_model_stats()
+            'model_stats': comparison.get_model_stats()
         })
     
     except Exception as e:
         return jsonify({'error': f'Model comparison failed: {str(e)}'}), 500
 
-
+if __name__ == '__main__':
+    print("🚀 Starting Right Advisor with REAL AI...")
+    
+    # Initialize analyzer
+    if initialize_analyzer():
+        print("🌐 Starting Flask server on http://localhost:5000")
+        print("📱 AI-Powered Legal Assistant Ready!")
+        app.run(debug=True, port=5000, host='0.0.0.0')
+    else:
+        print("❌ Failed to start server - AI analyzer initialization failed")
@@ -0,0 +1,257 @@
+# backend/bulk_classify.py
+"""Offline bulk classification of archived inquiries.
+
+Reads CSV, Parquet or NDJSON in chunks, classifies each chunk on a process
+pool (one analyzer per worker) and writes one output part per chunk.
+Completed chunks are recorded in a checkpoint so a killed job resumes
+where it stopped.
+
+    python bulk_classify.py inquiries.csv results/ --workers 16
+    python bulk_classify.py archive.parquet results/ --analyzer basic --output-format parquet
+
+Parquet input/output needs pyarrow; without it results default to NDJSON.
+"""
+import argparse
+import contextlib
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+sys.path.append(os.path.dirname(__file__))
+
+CHECKPOINT_FILE = 'checkpoint.json'
+PART_PATTERN = 'part-*'
+LIST_FIELDS = ('analysis', 'resources', 'relevant_laws', 'legal_citations')
+
+# Set in each worker process by _init_worker
+_worker_analyzer = None
+_worker_kind = None
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    if extension in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    return 'csv'
+
+
+def read_chunks(path, input_format, chunk_size):
+    """Yield lists of row dicts, ``chunk_size`` rows at a time"""
+    if input_format == 'parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+        return
+
+    with open(path, newline='', encoding='utf-8', errors='replace') as f:
+        if input_format == 'ndjson':
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            csv.field_size_limit(sys.maxsize)
+            rows = csv.DictReader(f)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def _init_worker(kind, snapshot_path):
+    """Build the analyzer once per worker process"""
+    global _worker_analyzer, _worker_kind
+    _worker_kind = kind
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        if kind == 'basic':
+            from legal_analyzer import LegalAnalyzer
+            _worker_analyzer = LegalAnalyzer(None)
+        else:
+            from warm_start import load_analyzer
+            _worker_analyzer = load_analyzer(snapshot_path)
+
+
+def _classify_chunk(task):
+    """Classify one chunk of rows in a worker; returns (chunk_index, records)"""
+    chunk_index, first_row, rows, text_column, id_column, jurisdiction_column = task
+    records = []
+    for offset, row in enumerate(rows):
+        text = str(row.get(text_column) or '')
+        if _worker_kind == 'basic':
+            result = _worker_analyzer.analyze_legal_issue(text)
+        else:
+            jurisdiction = row.get(jurisdiction_column) if jurisdiction_column else None
+            result = _worker_analyzer.analyze_with_ai(text, jurisdiction)
+
+        record = {'row': first_row + offset}
+        if id_column:
+            record['id'] = row.get(id_column)
+        record['category'] = result.get('category')
+        record['jurisdiction'] = result.get('jurisdiction')
+        record['ai_generated'] = result.get('ai_generated')
+        for field in LIST_FIELDS:
+            record[field] = result.get(field, [])
+        records.append(record)
+    return chunk_index, records
+
+
+def write_part(output_dir, chunk_index, records, output_format):
+    """Write one chunk of results atomically as part-NNNNNN.<format>"""
+    path = os.path.join(output_dir, f"part-{chunk_index:06d}.{output_format}")
+    tmp_path = f"{path}.tmp"
+    if output_format == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        pq.write_table(pa.Table.from_pylist(records), tmp_path)
+    elif output_format == 'ndjson':
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    else:
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(records[0]))
+            writer.writeheader()
+            for record in records:
+                writer.writerow({
+                    key: json.dumps(value, ensure_ascii=False) if key in LIST_FIELDS else value
+                    for key, value in record.items()
+                })
+    os.replace(tmp_path, path)
+
+
+def existing_parts(output_dir):
+    return glob.glob(os.path.join(output_dir, PART_PATTERN))
+
+
+def load_checkpoint(output_dir, job):
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        if existing_parts(output_dir):
+            raise SystemExit(
+                f"❌ {output_dir} already holds result parts but no checkpoint; "
+                "use a new output directory or pass --restart"
+            )
+        return set()
+    with open(path, encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    if checkpoint.get('job') != job:
+        raise SystemExit(
+            f"❌ {path} belongs to a different job ({checkpoint.get('job')}); "
+            "use a new output directory or pass --restart"
+        )
+    return set(checkpoint.get('completed', []))
+
+
+def save_checkpoint(output_dir, job, completed):
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'job': job, 'completed': sorted(completed)}, f)
+    os.replace(tmp_path, path)
+
+
+def default_output_format():
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return 'parquet'
+    except ImportError:
+        return 'ndjson'
+
+
+def run(args):
+    input_format = args.input_format or detect_format(args.input)
+    output_format = args.output_format or default_output_format()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    # Chunk boundaries and part contents depend on these, so a resumed job must use the same values
+    input_stat = os.stat(args.input)
+    job = {
+        'input': os.path.abspath(args.input),
+        # A file replaced at the same path (e.g. a nightly export) is a different job
+        'input_size': input_stat.st_size,
+        'input_mtime_ns': input_stat.st_mtime_ns,
+        'input_format': input_format,
+        'chunk_size': args.chunk_size,
+        'analyzer': args.analyzer,
+        'output_format': output_format,
+        'text_column': args.text_column,
+        'id_column': args.id_column,
+        'jurisdiction_column': args.jurisdiction_column,
+    }
+    if args.restart:
+        # Parts from the old job may not be overwritten (other chunk size or format), so drop them all
+        for path in existing_parts(args.output_dir) + [os.path.join(args.output_dir, CHECKPOINT_FILE)]:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+    completed = load_checkpoint(args.output_dir, job)
+    if completed:
+        print(f"↩️  Resuming: {len(completed)} chunks already done")
+
+    workers = args.workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    rows_done = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(args.analyzer, os.getenv('ANALYZER_SNAPSHOT'))
+    ) as executor:
+        in_flight = set()
+
+        def drain(return_when):
+            nonlocal in_flight, rows_done
+            done, in_flight = wait(in_flight, return_when=return_when)
+            for future in done:
+                chunk_index, records = future.result()
+                write_part(args.output_dir, chunk_index, records, output_format)
+                completed.add(chunk_index)
+                rows_done += len(records)
+            save_checkpoint(args.output_dir, job, completed)
+            elapsed = time.perf_counter() - start
+            print(f"📦 {len(completed)} chunks, {rows_done} rows this run ({rows_done / elapsed:.0f} rows/s)")
+
+        first_row = 0
+        for chunk_index, rows in enumerate(read_chunks(args.input, input_format, args.chunk_size)):
+            task_first_row = first_row
+            first_row += len(rows)
+            if chunk_index in completed:
+                continue
+            in_flight.add(executor.submit(
+                _classify_chunk,
+                (chunk_index, task_first_row, rows, args.text_column, args.id_column, args.jurisdiction_column)
+            ))
+            # Bound memory: never read far ahead of the workers
+            if len(in_flight) >= max_in_flight:
+                drain(FIRST_COMPLETED)
+        if in_flight:
+            drain(ALL_COMPLETED)
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Classified {rows_done} rows in {elapsed:.1f}s with {workers} workers -> {args.output_dir}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Classify archived legal inquiries in bulk")
+    parser.add_argument('input', help="CSV, Parquet or NDJSON file")
+    parser.add_argument('output_dir', help="directory for result parts and the checkpoint")
+    parser.add_argument('--input-format', choices=['csv', 'parquet', 'ndjson'])
+    parser.add_argument('--output-format', choices=['parquet', 'ndjson', 'csv'])
+    parser.add_argument('--text-column', default='text')
+    parser.add_argument('--id-column')
+    parser.add_argument('--jurisdiction-column')
+    parser.add_argument('--analyzer', choices=['hf', 'basic'], default='hf',
+                        help="hf: HFLegalAnalyzer.analyze_with_ai, basic: LegalAnalyzer.analyze_legal_issue")
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--restart', action='store_true', help="delete an existing checkpoint and result parts")
+    run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,35 @@
 # backend/hf_config.py
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
 
 class HFConfig:
-    HF_TOKEN = os.getenv('HF_TOKEN')
-    
+    HF_TOKEN = None
+    _loaded = False
+
+    @classmethod
+    def load(cls):
+        """Read .env on first use instead of at import time"""
+        if not cls._loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            cls.HF_TOKEN = os.getenv('HF_TOKEN')
+            cls._loaded = True
+        return cls
+
+    @classmethod
+    def has_env_file(cls):
+        """Whether load() would find a .env file (same search as python-dotenv, without importing it)"""
+        path = os.path.dirname(os.path.abspath(__file__))
+        while True:
+            if os.path.isfile(os.path.join(path, '.env')):
+                return True
+            parent = os.path.dirname(path)
+            if parent == path:
+                return False
+            path = parent
+
     @classmethod
-    def is_configured(cls):
+    def is_configured(cls, load_env=True):
+        if not load_env and not cls._loaded:
+            return bool(os.getenv('HF_TOKEN'))
+        cls.load()
         return cls.HF_TOKEN is not None and cls.HF_TOKEN != ''
\ No newline at end of file
@@ -1,18 +1,56 @@
 # backend/hf_legal_analyzer.py
-import requests
-import json
+import re
 from hf_config import HFConfig
+from jurisdiction_rules import DEFAULT_JURISDICTION, JurisdictionRules
+from keyword_index import KeywordIndex
 
 class HFLegalAnalyzer:
-    def __init__(self):
+    def __init__(self, snapshot_state=None):
         self.setup_analyzer()
-        self.legal_database = self._setup_legal_database()
+        if snapshot_state is not None:
+            # Warm start: reuse the merged rule table and keyword index built by a previous worker
+            self.legal_database = snapshot_state['legal_database']
+            self.category_keywords = snapshot_state['category_keywords']
+            self.issue_keywords = snapshot_state['issue_keywords']
+            self.jurisdiction_rules = snapshot_state['jurisdiction_rules']
+            self.keyword_index = snapshot_state['keyword_index']
+        else:
+            self.legal_database = self._setup_legal_database()
+            self.category_keywords, self.issue_keywords = self._setup_keyword_tables()
+            self.jurisdiction_rules = JurisdictionRules(self.legal_database)
+            self.keyword_index = KeywordIndex(self.category_keywords, self.issue_keywords)
+        
+        # Always compiled here: unpickling a regex recompiles it, so snapshots would save nothing
+        self.category_matchers = self._compile_matchers(self.category_keywords)
+        self.issue_matchers = {
+            category: self._compile_matchers(issues)
+            for category, issues in self.issue_keywords.items()
+        }
+        # Whole-word variants for normalized text, where tokens are already canonical
+        self.category_word_matchers = self._compile_matchers(self.category_keywords, whole_words=True)
+        self.issue_word_matchers = {
+            category: self._compile_matchers(issues, whole_words=True)
+            for category, issues in self.issue_keywords.items()
+        }
+    
+    def export_state(self):
+        """Return the warmed analyzer state for snapshotting"""
+        return {
+            'legal_database': self.legal_database,
+            'category_keywords': self.category_keywords,
+            'issue_keywords': self.issue_keywords,
+            'jurisdiction_rules': self.jurisdiction_rules,
+            'keyword_index': self.keyword_index
+        }
     
     def setup_analyzer(self):
         """Setup the AI analyzer"""
         print("🤖 Initializing Enhanced Legal Analyzer...")
-        if HFConfig.is_configured():
+        # Only check the process environment here; .env is read on first API use
+        if HFConfig.is_configured(load_env=False):
             print("✅ Hugging Face API configured")
+        elif HFConfig.has_env_file():
+            print("✅ Found .env; Hugging Face settings are read on first use")
         else:
             print("⚠️  Using enhanced fallback analysis")
         print("✅ Enhanced Legal Analyzer ready!")
@@ -65,6 +103,7 @@ class HFLegalAnalyzer:
                         "Equal Pay Act of 1963"
                     ],
                     "overtime": "1.5x regular rate for hours over 40 per workweek",
+                    "overtime_law": "the Fair Labor Standards Act 29 U.S.C. § 207",
                     "minimum_wage": "Federal minimum: $7.25/hour (higher in many states)"
                 },
                 "discrimination": {
@@ -132,32 +171,9 @@ class HFLegalAnalyzer:
             }
         }
     
-    def analyze_with_ai(self, user_input):
-        """Analyze legal issue with authoritative legal citations"""
-        try:
-            category = self._classify_issue(user_input)
-            specific_issue = self._identify_specific_issue(user_input, category)
-            
-            analysis = self._generate_authoritative_analysis(user_input, category, specific_issue)
-            
-            return {
-                'category': category,
-                'analysis': analysis,
-                'resources': self._get_legal_resources(category),
-                'relevant_laws': self._get_specific_laws(category, specific_issue),
-                'ai_generated': True,
-                'legal_citations': self._get_legal_citations(category, specific_issue)
-            }
-            
-        except Exception as e:
-            print(f"❌ AI Analysis Error: {e}")
-            return self._get_fallback_analysis(user_input)
-    
-    def _classify_issue(self, user_input):
-        """Enhanced classification"""
-        text_lower = user_input.lower()
-        
-        categories = {
+    def _setup_keyword_tables(self):
+        """Setup keyword tables used for category and issue classification"""
+        category_keywords = {
             "housing and landlord tenant law": [
                 'landlord', 'tenant', 'rent', 'lease', 'eviction', 
                 'security deposit', 'apartment', 'housing', 'property manager',
@@ -179,17 +195,7 @@ class HFLegalAnalyzer:
             ]
         }
         
-        for category, keywords in categories.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return category
-        
-        return "general legal matter"
-    
-    def _identify_specific_issue(self, user_input, category):
-        """Identify specific legal issue within category"""
-        text_lower = user_input.lower()
-        
-        issue_mapping = {
+        issue_keywords = {
             "housing and landlord tenant law": {
                 "security_deposit": ['security deposit', 'deposit', 'move out'],
                 "rent_increase": ['rent increase', 'rent raised', 'rent hike'],
@@ -216,17 +222,144 @@ class HFLegalAnalyzer:
             }
         }
         
-        if category in issue_mapping:
-            for issue, keywords in issue_mapping[category].items():
-                if any(keyword in text_lower for keyword in keywords):
-                    return issue
+        return category_keywords, issue_keywords
+    
+    def _compile_matchers(self, keyword_table, whole_words=False):
+        """Compile each keyword list into a single substring- (or whole-word-) matching regex"""
+        template = r'\b(?:{})\b' if whole_words else '{}'
+        return {
+            label: re.compile(template.format('|'.join(re.escape(keyword) for keyword in keywords)))
+            for label, keywords in keyword_table.items()
+        }
+    
+    def analyze_with_ai(self, user_input, jurisdiction=None, explain=False):
+        """Analyze legal issue with authoritative legal citations"""
+        try:
+            # Explain mode records matches while classifying instead of re-scanning afterwards
+            trace = {'category': {}, 'issue': {}} if explain else None
+            category = self._classify_issue(user_input, trace['category'] if trace else None)
+            specific_issue = self._identify_specific_issue(user_input, category, trace['issue'] if trace else None)
+            resolved_code = self.jurisdiction_rules.resolve(jurisdiction)
+            # Unrecognised jurisdictions get federal rules but are reported as unresolved
+            jurisdiction_code = resolved_code or DEFAULT_JURISDICTION
+            
+            analysis = self._generate_authoritative_analysis(user_input, category, specific_issue, jurisdiction_code)
+            
+            result = {
+                'category': category,
+                'jurisdiction': resolved_code,
+                'analysis': analysis,
+                'resources': self._get_legal_resources(category),
+                'relevant_laws': self._get_specific_laws(category, specific_issue, jurisdiction_code),
+                'ai_generated': True,
+                'legal_citations': self._get_legal_citations(category, specific_issue)
+            }
+            
+            if trace is not None:
+                has_rule = self.jurisdiction_rules.lookup(jurisdiction_code, category, specific_issue) is not None
+                trace['jurisdiction'] = {
+                    'requested': jurisdiction,
+                    'resolved': resolved_code,
+                    'applied': jurisdiction_code,
+                    'fallback_chain': self.jurisdiction_rules.chains.get(jurisdiction_code, [jurisdiction_code])
+                }
+                trace['rule'] = f"{jurisdiction_code}/{category}/{specific_issue}" if has_rule else None
+                result['explanation'] = trace
+            
+            return result
+            
+        except Exception as e:
+            print(f"❌ AI Analysis Error: {e}")
+            return self._get_fallback_analysis(user_input)
+    
+    def _match_first(self, matchers, word_matchers, text_lower, trace=None):
+        """Return the first label whose matcher fires, retrying on normalized text.
         
+        With a ``trace`` dict, every label is scanned with finditer and the
+        matched keywords, offsets, per-label scores and deciding stage are
+        recorded; the decision itself is the same as without a trace.
+        """
+        if trace is not None:
+            trace.update(decision=None, stage='default', scores={}, matches=[])
+        
+        decision = self._scan_matchers(matchers, text_lower, 'exact', trace)
+        if decision is not None:
+            return decision
+        
+        # Typos, inflections, synonyms and Spanish/Hindi terms
+        offsets = [] if trace is not None else None
+        normalized = self.keyword_index.normalize(text_lower, offsets)
+        return self._scan_matchers(word_matchers, normalized, 'normalized', trace, offsets)
+    
+    def _scan_matchers(self, matchers, text, stage, trace, offsets=None):
+        """One classification pass over ``text``; stops at the first hit unless tracing"""
+        if trace is None:
+            for label, matcher in matchers.items():
+                if matcher.search(text):
+                    return label
+            return None
+        
+        decision = None
+        for label, matcher in matchers.items():
+            for match in matcher.finditer(text):
+                start, end = match.span()
+                if offsets is not None:
+                    # Map the span in normalized text back to the original input
+                    pieces = [piece for piece in offsets if piece[0] < end and piece[1] > start]
+                    start, end = pieces[0][2], pieces[-1][3]
+                trace['matches'].append({'label': label, 'keyword': match.group(), 'start': start, 'end': end})
+                trace['scores'][label] = trace['scores'].get(label, 0) + 1
+                if decision is None:
+                    decision = label
+        
+        if decision is not None:
+            trace['decision'] = decision
+            trace['stage'] = stage
+        return decision
+    
+    def _map_spans_to_input(self, trace, user_input, text_lower):
+        """Rewrite match offsets from ``text_lower`` to ``user_input``.
+        
+        Lowercasing can lengthen the text ('İ' becomes two characters), so
+        spans are shifted back through a per-character position map.
+        """
+        if len(text_lower) == len(user_input):
+            return
+        positions = [i for i, char in enumerate(user_input) for _ in char.lower()]
+        positions.append(len(user_input))
+        for match in trace['matches']:
+            match['start'] = positions[match['start']]
+            match['end'] = positions[match['end'] - 1] + 1
+    
+    def _classify_issue(self, user_input, trace=None):
+        """Enhanced classification"""
+        text_lower = user_input.lower()
+        
+        category = self._match_first(self.category_matchers, self.category_word_matchers, text_lower, trace)
+        if trace is not None:
+            self._map_spans_to_input(trace, user_input, text_lower)
+        return category or "general legal matter"
+    
+    def _identify_specific_issue(self, user_input, category, trace=None):
+        """Identify specific legal issue within category"""
+        text_lower = user_input.lower()
+        
+        if category in self.issue_matchers:
+            issue = self._match_first(
+                self.issue_matchers[category], self.issue_word_matchers[category], text_lower, trace
+            )
+            if trace is not None:
+                self._map_spans_to_input(trace, user_input, text_lower)
+            return issue or "general"
+        
+        if trace is not None:
+            trace.update(decision=None, stage='default', scores={}, matches=[])
         return "general"
     
-    def _generate_authoritative_analysis(self, user_input, category, specific_issue):
+    def _generate_authoritative_analysis(self, user_input, category, specific_issue, jurisdiction_code=DEFAULT_JURISDICTION):
         """Generate analysis with authoritative legal language"""
-        if category in self.legal_database and specific_issue in self.legal_database[category]:
-            issue_data = self.legal_database[category][specific_issue]
+        issue_data = self.jurisdiction_rules.lookup(jurisdiction_code, category, specific_issue)
+        if issue_data:
             return self._create_authoritative_points(category, specific_issue, issue_data, user_input)
         else:
             return self._general_authoritative_analysis(category, user_input)
@@ -242,9 +375,15 @@ class HFLegalAnalyzer:
             points.append(f"Remedies available include statutory damages up to {issue_data['remedies']} for failure to comply with deposit return requirements.")
             points.append("Document all communications and consider formal demand letter before initiating legal action.")
         
+        elif specific_issue == "rent_increase":
+            points.append(f"Under {issue_data['laws'][0]} and the terms of your lease, a rent increase requires proper written notice: {issue_data['notice_period']}.")
+            points.append(f"{issue_data['limitations']}; an increase above the permitted amount may be unenforceable.")
+            points.append("During a fixed-term lease, rent generally cannot be raised unless the lease agreement expressly allows it.")
+            points.append("Increases made in retaliation for complaints or repair requests may violate anti-retaliation statutes and the covenant of quiet enjoyment.")
+        
         elif specific_issue == "wages":
-            points.append(f"In accordance with the Fair Labor Standards Act 29 U.S.C. § 207, non-exempt employees are entitled to overtime compensation at 1.5 times their regular rate for hours worked beyond 40 per workweek.")
-            points.append(f"State wage and hour laws may provide additional protections beyond federal requirements, including higher minimum wage rates.")
+            points.append(f"In accordance with {issue_data['overtime_law']}, non-exempt employees are entitled to overtime compensation of {issue_data['overtime']}.")
+            points.append(f"State wage and hour laws may provide additional protections beyond federal requirements, including higher minimum wage rates. {issue_data['minimum_wage']}.")
             points.append(f"Employers must maintain accurate records of hours worked as required by Department of Labor regulations 29 CFR § 516.")
             points.append("File a wage claim with the state labor department or consider private action for recovery of unpaid wages with potential liquidated damages.")
         
@@ -279,10 +418,11 @@ class HFLegalAnalyzer:
             "Retain qualified legal counsel to evaluate specific claims and potential litigation strategies."
         ]
     
-    def _get_specific_laws(self, category, specific_issue):
+    def _get_specific_laws(self, category, specific_issue, jurisdiction_code=DEFAULT_JURISDICTION):
         """Get specific laws for the issue"""
-        if category in self.legal_database and specific_issue in self.legal_database[category]:
-            return self.legal_database[category][specific_issue]['laws']
+        issue_data = self.jurisdiction_rules.lookup(jurisdiction_code, category, specific_issue)
+        if issue_data:
+            return issue_data['laws']
         return ["General Legal Principles", "State-Specific Statutes"]
     
     def _get_legal_citations(self, category, specific_issue):
@@ -0,0 +1,97 @@
+# backend/jurisdiction_rules.py
+import json
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_JURISDICTION = 'US'
+
+
+class JurisdictionRules:
+    """Jurisdiction-aware legal rules indexed by (jurisdiction, category, issue).
+
+    Jurisdiction codes are hierarchical (``US`` -> ``US-CA`` -> ``US-CA-SF``).
+    Each level only stores what differs from its parent; every code's
+    city -> state -> federal chain is merged once at load time, so a lookup
+    is a single dict access.
+    """
+
+    def __init__(self, base_database, data_dir=DATA_DIR):
+        with open(os.path.join(data_dir, 'jurisdictions.json'), encoding='utf-8') as f:
+            self.names = json.load(f)
+        with open(os.path.join(data_dir, 'jurisdiction_rules.json'), encoding='utf-8') as f:
+            overrides = json.load(f)
+
+        for code in overrides:
+            self.names.setdefault(code, code)
+
+        self.aliases = self._build_aliases(self.names)
+        self.chains = {code: self._fallback_chain(code) for code in self.names}
+        self.table = self._build_table(base_database, overrides)
+
+    def _fallback_chain(self, code):
+        """Most specific first, e.g. US-CA-SF -> [US-CA-SF, US-CA, US]"""
+        parts = code.split('-')
+        return ['-'.join(parts[:i]) for i in range(len(parts), 0, -1)]
+
+    def _build_aliases(self, names):
+        """Map lowercase codes, names and state postal codes to canonical codes"""
+        aliases = {}
+        for code, name in names.items():
+            aliases[code.lower()] = code
+            aliases[name.lower()] = code
+            parts = code.split('-')
+            if len(parts) == 2:
+                aliases[parts[1].lower()] = code
+        return aliases
+
+    def _merge(self, parent, own):
+        """Overlay a jurisdiction's rule on its parent's; laws accumulate, most specific first"""
+        merged = dict(parent or {})
+        for key, value in own.items():
+            if key == 'laws':
+                inherited = [law for law in merged.get('laws', []) if law not in value]
+                merged['laws'] = list(value) + inherited
+            else:
+                merged[key] = value
+        return merged
+
+    def _build_table(self, base_database, overrides):
+        issues = {
+            (category, issue)
+            for category, category_issues in base_database.items()
+            for issue in category_issues
+        }
+        for rules in overrides.values():
+            for category, category_issues in rules.items():
+                issues.update((category, issue) for issue in category_issues)
+
+        table = {}
+        # Parents sort before children, so each level is merged exactly once
+        for code in sorted(self.names, key=lambda c: c.count('-')):
+            parent_code = self.chains[code][1] if len(self.chains[code]) > 1 else None
+            own_rules = overrides.get(code, {})
+            for category, issue in issues:
+                if parent_code is None:
+                    parent = base_database.get(category, {}).get(issue)
+                else:
+                    parent = table.get((parent_code, category, issue))
+
+                own = own_rules.get(category, {}).get(issue)
+                # Unchanged rules share the parent's dict instead of copying it
+                rule = self._merge(parent, own) if own else parent
+                if rule is not None:
+                    table[(code, category, issue)] = rule
+        return table
+
+    def resolve(self, jurisdiction):
+        """Return the canonical code for a user-supplied jurisdiction.
+
+        No jurisdiction means federal; one that is not recognised returns None.
+        """
+        if not jurisdiction:
+            return DEFAULT_JURISDICTION
+        return self.aliases.get(str(jurisdiction).strip().lower())
+
+    def lookup(self, jurisdiction_code, category, issue):
+        """Return the merged rule for a canonical jurisdiction code, or None"""
+        return self.table.get((jurisdiction_code, category, issue))
@@ -0,0 +1,234 @@
+# backend/keyword_index.py
+import json
+import os
+import re
+import unicodedata
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# Latin words plus Devanagari runs (vowel signs and viramas are not \w)
+TOKEN_RE = re.compile(r"[\w\u0900-\u097F]+")
+
+# Checked in order; 'ies' -> 'y' is handled separately. Agent nouns ('-er')
+# are left alone so 'workers' doesn't collapse onto 'working'
+SUFFIXES = ('ings', 'ing', 'ions', 'ion', 'es', 'ed', 's')
+
+MAX_PHRASE_TOKENS = 3
+
+# canonical_token results kept per index before the cache is reset
+TOKEN_CACHE_SIZE = 65536
+
+
+def fold(token):
+    """Strip accents from Latin words; leave other scripts as-is (NFC)"""
+    token = unicodedata.normalize('NFC', token)
+    if token.isascii():
+        return token
+    stripped = ''.join(
+        c for c in unicodedata.normalize('NFKD', token) if not unicodedata.combining(c)
+    )
+    return stripped if stripped.isascii() else token
+
+
+def stem(word):
+    """Light suffix stripper so 'evicted', 'eviction' and 'evicting' share a stem"""
+    if word.endswith('ies') and len(word) > 4:
+        return word[:-3] + 'y'
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    if word.endswith('e') and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+def max_edit_distance(word):
+    """Short words get no fuzzy matching; longer words tolerate more typos"""
+    if len(word) < 5:
+        return 0
+    if len(word) < 8:
+        return 1
+    return 2
+
+
+def deletes(word, distance):
+    """All strings reachable from ``word`` by deleting up to ``distance`` characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance (counts adjacent transpositions), capped at limit + 1"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev_prev = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(prev[j] + 1, current[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], prev_prev[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        prev_prev, prev = prev, current
+    return prev[-1]
+
+
+class KeywordIndex:
+    """Precomputed normalization index for keyword classification.
+
+    ``normalize`` rewrites free text into the analyzer's canonical keyword
+    vocabulary: synonyms and translations become their English keyword,
+    inflected forms map through a stem table and typos are corrected with a
+    SymSpell-style deletion index (edit distance <= 2). Like SymSpell, only
+    tokens missing from an English dictionary are treated as typos, so real
+    words such as 'painting' are never rewritten into keywords. The result can be fed
+    to the same compiled matchers as the raw text, so robust matching costs
+    one pass of dict lookups over the tokens.
+    """
+
+    def __init__(self, category_keywords, issue_keywords, data_dir=DATA_DIR):
+        with open(os.path.join(data_dir, 'keyword_synonyms.json'), encoding='utf-8') as f:
+            data = json.load(f)
+
+        keywords = [kw for kws in category_keywords.values() for kw in kws]
+        keywords += [kw for issues in issue_keywords.values() for kws in issues.values() for kw in kws]
+        self.vocabulary = {token for kw in keywords for token in TOKEN_RE.findall(kw)}
+
+        self.synonyms = {}
+        self.phrases = {}
+        for table in data['synonyms'].values():
+            for term, canonical in table.items():
+                tokens = [fold(token) for token in TOKEN_RE.findall(term.lower())]
+                target = self.phrases if len(tokens) > 1 else self.synonyms
+                target[' '.join(tokens)] = canonical
+        # Real words never rewritten, not even through the stem table ('parents')
+        self.common_words = set(data.get('common_words', []))
+        # English dictionary, loaded on first typo check and left out of snapshots
+        self.lexicon_path = os.path.join(data_dir, 'english_words.txt')
+        self._lexicon = None
+
+        # Longest token wins a stem so substring matchers still fire ('evict' in 'eviction')
+        self.stems = {}
+        for token in sorted(self.vocabulary, key=len):
+            self.stems[stem(token)] = token
+
+        # Deletion index over Latin vocabulary and synonyms: delete-string -> words
+        self.fuzzy_targets = {token: token for token in self.vocabulary}
+        self.fuzzy_targets.update(
+            (term, canonical) for term, canonical in self.synonyms.items() if term.isascii()
+        )
+        self.deletion_index = {}
+        for word in self.fuzzy_targets:
+            for variant in deletes(word, max_edit_distance(word)):
+                self.deletion_index.setdefault(variant, []).append(word)
+
+        self._token_cache = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_lexicon'] = None
+        return state
+
+    def is_known_word(self, token):
+        """Whether ``token`` is a real English word (5+ letters) and so not a typo"""
+        if self._lexicon is None:
+            with open(self.lexicon_path, encoding='utf-8') as f:
+                self._lexicon = frozenset(f.read().split())
+        return token in self._lexicon
+
+    def canonical_token(self, token):
+        """Map one folded token to its canonical keyword form (or itself)"""
+        canonical = self._token_cache.get(token)
+        if canonical is None:
+            if len(self._token_cache) >= TOKEN_CACHE_SIZE:
+                self._token_cache.clear()
+            canonical = self._token_cache[token] = self._canonical_token(token)
+        return canonical
+
+    def _canonical_token(self, token):
+        if token in self.vocabulary:
+            return token
+        if token in self.synonyms:
+            return self.synonyms[token]
+        if token in self.common_words:
+            return token
+        stemmed = stem(token)
+        if stemmed in self.stems:
+            return self.stems[stemmed]
+        if not token.isascii() or max_edit_distance(token) == 0 or self.is_known_word(token):
+            return token
+        corrected = self._correct_typo(token)
+        if corrected == token and stemmed != token:
+            # 'harrassed' is too far from any keyword, but its stem is close to 'harass'
+            corrected = self._correct_typo(stemmed)
+            return token if corrected == stemmed else corrected
+        return corrected
+
+    def _correct_typo(self, token):
+        distance = max_edit_distance(token)
+        if distance == 0:
+            return token
+
+        best, best_distance, tied = None, distance + 1, False
+        seen = set()
+        for variant in deletes(token, distance):
+            for word in self.deletion_index.get(variant, ()):
+                if word in seen:
+                    continue
+                seen.add(word)
+                # Typos rarely hit the first letter; 'hired' and 'tired' are not 'fired'
+                if word[0] != token[0]:
+                    continue
+                limit = min(distance, max_edit_distance(word))
+                d = edit_distance(token, word, limit)
+                if d > limit:
+                    continue
+                if d < best_distance:
+                    best, best_distance, tied = word, d, False
+                elif d == best_distance and self.fuzzy_targets[word] != self.fuzzy_targets[best]:
+                    tied = True
+
+        # Ambiguous corrections are worse than none
+        if best is None or tied:
+            return token
+        return self.fuzzy_targets[best]
+
+    def normalize(self, text_lower, offsets=None):
+        """Rewrite lowercase text into canonical keyword tokens.
+
+        If ``offsets`` is a list, one ``(norm_start, norm_end, start, end)``
+        tuple is appended per output piece, mapping it back to ``text_lower``.
+        """
+        if offsets is None:
+            tokens = [fold(token) for token in TOKEN_RE.findall(text_lower)]
+        else:
+            found = list(TOKEN_RE.finditer(text_lower))
+            tokens = [fold(match.group()) for match in found]
+
+        out = []
+        length = 0
+        i = 0
+        while i < len(tokens):
+            for size in range(min(MAX_PHRASE_TOKENS, len(tokens) - i), 1, -1):
+                phrase = ' '.join(tokens[i:i + size])
+                if phrase in self.phrases:
+                    piece = self.phrases[phrase]
+                    break
+            else:
+                size = 1
+                piece = self.canonical_token(tokens[i])
+
+            if offsets is not None:
+                offsets.append((length, length + len(piece), found[i].start(), found[i + size - 1].end()))
+                length += len(piece) + 1
+            out.append(piece)
+            i += size
+        return ' '.join(out)
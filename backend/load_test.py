@@ -0,0 +1,281 @@
+# backend/load_test.py
+"""Open-loop load generator for the Right Advisor API.
+
+Replays a corpus of realistic inquiries against /api/analyze and
+/api/analyze/batch (and /api/compare-models when asked for) at a fixed
+arrival rate and reports throughput, latency percentiles and error rates.
+
+    python load_test.py --rate 200 --duration 30
+    python load_test.py --url http://localhost:5000 --mix analyze=8,batch=1,compare=1
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(__file__))
+
+TEMPLATES = [
+    "My {a} is refusing to deal with the {b}. What are my rights?",
+    "I have a dispute about {a} and {b}, can I take legal action?",
+    "Last month there was a problem with the {b}. Who is responsible, me or the {a}?",
+    "What does the law say about {a} when {b} is involved?",
+    "I need help: {a}, {b}, and I don't know where to start.",
+]
+
+GENERAL_INQUIRIES = [
+    "I need advice about a legal situation I'm in.",
+    "Someone owes me money and won't pay it back.",
+    "My neighbour's tree fell on my fence, who pays for it?",
+    "How do I find a lawyer I can afford?",
+]
+
+ENDPOINTS = {
+    'analyze': '/api/analyze',
+    'batch': '/api/analyze/batch',
+    'compare': '/api/compare-models',
+}
+
+
+def load_lexglue_sample(path, limit):
+    """Read up to ``limit`` texts from the CSV files of a downloaded LexGLUE dataset"""
+    texts = []
+    csv.field_size_limit(sys.maxsize)
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            if not name.endswith('.csv'):
+                continue
+            with open(os.path.join(root, name), newline='', encoding='utf-8', errors='replace') as f:
+                for row in csv.DictReader(f):
+                    text = row.get('text') or row.get('context') or ''
+                    if text.strip():
+                        # Case-law documents are long; inquiries are a paragraph at most
+                        texts.append(text.strip()[:1000])
+                    if len(texts) >= limit:
+                        return texts
+    return texts
+
+
+def build_corpus(analyzer, size, seed=0, lexglue_path=None):
+    """Generate realistic inquiries from the analyzer's keyword tables (plus LexGLUE if given)"""
+    rng = random.Random(seed)
+    issue_terms = [
+        (category, keywords)
+        for category, issues in analyzer.issue_keywords.items()
+        for keywords in issues.values()
+    ]
+    jurisdictions = [None] * 4 + sorted(analyzer.jurisdiction_rules.names)
+
+    lexglue = load_lexglue_sample(lexglue_path, size // 4) if lexglue_path else []
+
+    corpus = []
+    for i in range(size):
+        roll = rng.random()
+        if lexglue and roll < 0.25:
+            text = lexglue[i % len(lexglue)]
+        elif roll < 0.35:
+            text = rng.choice(GENERAL_INQUIRIES)
+        else:
+            category, keywords = rng.choice(issue_terms)
+            text = rng.choice(TEMPLATES).format(
+                a=rng.choice(analyzer.category_keywords[category]),
+                b=rng.choice(keywords)
+            )
+        corpus.append({'text': text, 'jurisdiction': rng.choice(jurisdictions)})
+    return corpus
+
+
+class InProcessTarget:
+    """Sends requests through the Flask test client, one client per thread"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def post(self, path, payload):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        return client.post(path, json=payload).status_code
+
+
+class HttpTarget:
+    """Sends requests to a running server over HTTP"""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def post(self, path, payload):
+        req = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+def parse_mix(spec):
+    """Parse 'analyze=8,batch=1,compare=1' into endpoint weights"""
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}', expected one of {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_load(target, corpus, rate, duration, mix, batch_size=10, workers=64, poisson=False, seed=0):
+    """Fire requests on an open-loop schedule and collect per-request outcomes.
+
+    Latency is measured from each request's scheduled start, not from when a
+    worker picked it up, so a saturated server shows up as growing latency
+    instead of silently lowering the offered rate.
+    """
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    results = []
+    results_lock = threading.Lock()
+
+    def fire(name, payload, scheduled):
+        try:
+            status = target.post(ENDPOINTS[name], payload)
+        except Exception:
+            status = None
+        latency = time.perf_counter() - scheduled
+        with results_lock:
+            results.append((name, status, latency))
+
+    total = int(rate * duration)
+    start = time.perf_counter()
+    scheduled = start
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for i in range(total):
+            scheduled += rng.expovariate(rate) if poisson else 1.0 / rate
+            name = rng.choices(names, weights)[0]
+            if name == 'batch':
+                items = [corpus[(i + k) % len(corpus)] for k in range(batch_size)]
+                payload = {'texts': [item['text'] for item in items]}
+            else:
+                payload = corpus[i % len(corpus)]
+
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(fire, name, payload, scheduled)
+    elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+def summarize(results, elapsed, rate):
+    """Build the throughput / latency / error report"""
+    report = {
+        'offered_rate': rate,
+        'elapsed_s': round(elapsed, 3),
+        'requests': len(results),
+        'throughput_rps': round(len(results) / elapsed, 2) if elapsed else 0.0,
+        'endpoints': {}
+    }
+    for name in sorted({name for name, _, _ in results}):
+        rows = [(status, latency) for n, status, latency in results if n == name]
+        latencies = sorted(latency * 1000 for _, latency in rows)
+        errors = sum(1 for status, _ in rows if status is None or status >= 400)
+        statuses = {}
+        for status, _ in rows:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        report['endpoints'][name] = {
+            'requests': len(rows),
+            'error_rate': round(errors / len(rows), 4),
+            'statuses': statuses,
+            'latency_ms': {
+                'p50': round(percentile(latencies, 50), 2),
+                'p90': round(percentile(latencies, 90), 2),
+                'p99': round(percentile(latencies, 99), 2),
+                'max': round(latencies[-1], 2),
+            }
+        }
+    return report
+
+
+def print_report(report):
+    print(f"📊 {report['requests']} requests in {report['elapsed_s']}s "
+          f"(offered {report['offered_rate']}/s, achieved {report['throughput_rps']}/s)")
+    for name, stats in report['endpoints'].items():
+        latency = stats['latency_ms']
+        print(f"   {name:<8} n={stats['requests']:<7} errors={stats['error_rate']:.2%}  "
+              f"p50={latency['p50']}ms p90={latency['p90']}ms p99={latency['p99']}ms max={latency['max']}ms  "
+              f"statuses={stats['statuses']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay realistic traffic against the Right Advisor API")
+    parser.add_argument('--rate', type=float, default=50, help="requests per second to offer")
+    parser.add_argument('--duration', type=float, default=10, help="seconds to run")
+    # compare needs the optional model comparison module, so it is opt-in
+    parser.add_argument('--mix', default='analyze=9,batch=1', help="endpoint weights, e.g. analyze=8,batch=1,compare=1")
+    parser.add_argument('--url', help="base URL of a running server (default: in-process test client)")
+    parser.add_argument('--corpus-size', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=64)
+    parser.add_argument('--lexglue', help="path to a downloaded LexGLUE dataset to mix into the corpus")
+    parser.add_argument('--poisson', action='store_true', help="use Poisson arrivals instead of a fixed interval")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    # Measure the node, not the per-client limiter, when running in-process
+    if not args.url:
+        os.environ.setdefault('RATE_LIMIT_PER_SECOND', '1000000')
+        os.environ.setdefault('RATE_LIMIT_BURST', '1000000')
+
+    from warm_start import load_analyzer
+
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        analyzer = load_analyzer(os.getenv('ANALYZER_SNAPSHOT'))
+        if args.url:
+            target = HttpTarget(args.url)
+        else:
+            import app as app_module
+            app_module.analyzer = analyzer
+            target = InProcessTarget(app_module.app)
+
+        corpus = build_corpus(analyzer, args.corpus_size, args.seed, args.lexglue)
+        results, elapsed = run_load(
+            target, corpus, args.rate, args.duration, parse_mix(args.mix),
+            batch_size=args.batch_size, workers=args.workers, poisson=args.poisson, seed=args.seed
+        )
+
+    report = summarize(results, elapsed, args.rate)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return report
+
+
+if __name__ == "__main__":
+    main()
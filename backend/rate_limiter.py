@@ -0,0 +1,310 @@
+# backend/rate_limiter.py
+import hashlib
+import math
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+
+from flask import current_app, g, jsonify, request
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+RateLimitResult = namedtuple(
+    'RateLimitResult', ['allowed', 'limit', 'remaining', 'reset_after', 'quota', 'quota_remaining']
+)
+
+RATE_LIMIT_HEADERS = [
+    'X-RateLimit-Limit', 'X-RateLimit-Remaining', 'X-RateLimit-Reset', 'Retry-After',
+    'X-Quota-Limit', 'X-Quota-Remaining'
+]
+
+# Length of a quota window in seconds
+QUOTA_WINDOW = 86400
+
+
+class InProcessBucketStore:
+    """Token buckets and quota counters for a single worker process.
+
+    Buckets are kept in least-recently-used order; ones idle for longer than
+    ``idle_ttl`` seconds, or beyond ``max_keys``, are evicted. Quota counters
+    are kept apart from the buckets so eviction never resets them; they are
+    dropped all at once when a new quota window starts.
+    """
+
+    def __init__(self, max_keys=10000, idle_ttl=3600):
+        self.max_keys = max_keys
+        self.idle_ttl = idle_ttl
+        self._lock = threading.Lock()
+        # key -> [tokens, updated], oldest first
+        self._buckets = OrderedDict()
+        # key -> [allowed, rejected] for the current quota window
+        self._counters = {}
+        self._window = None
+
+    def _evict(self, now):
+        while self._buckets:
+            oldest = next(iter(self._buckets.values()))
+            if len(self._buckets) <= self.max_keys and now - oldest[1] < self.idle_ttl:
+                break
+            self._buckets.popitem(last=False)
+
+    def take(self, key, rate, burst, cost, now, window, quota=None):
+        with self._lock:
+            if window != self._window:
+                self._counters.clear()
+                self._window = window
+            counters = self._counters.setdefault(key, [0, 0])
+
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [burst, now]
+            else:
+                self._buckets.move_to_end(key)
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            within_quota = quota is None or counters[0] + cost <= quota
+            allowed = within_quota and tokens >= min(cost, burst)
+            if allowed:
+                tokens -= cost
+                counters[0] += cost
+            else:
+                counters[1] += cost
+            bucket[0] = tokens
+            bucket[1] = now
+            self._evict(now)
+            return allowed, tokens, counters[0]
+
+    def usage(self, key, window):
+        with self._lock:
+            counters = self._counters.get(key) if window == self._window else None
+            return {'allowed': counters[0], 'rejected': counters[1]} if counters else {'allowed': 0, 'rejected': 0}
+
+
+class SharedMemoryBucketStore:
+    """Token buckets kept in a shared-memory segment so all workers on a host share limits.
+
+    The segment is a fixed-size open-addressed table of slots keyed by a
+    64-bit hash of the client key. Each slot also holds the key's quota
+    counters for the current window, so a slot is only reclaimed for a new
+    key once it has been idle for ``idle_ttl`` seconds *and* its window has
+    ended. When every slot near a key's home is live, that key falls back to
+    a per-process bucket. A file lock serialises access across processes and
+    a thread lock across threads within one process.
+    """
+
+    SLOT = struct.Struct('<QddqQQ')  # key hash, tokens, updated, window, allowed, rejected
+    MAX_PROBES = 8
+
+    def __init__(self, name, slots=4096, idle_ttl=3600):
+        from multiprocessing import shared_memory
+
+        self.slots = slots
+        self.idle_ttl = idle_ttl
+        self._overflow = InProcessBucketStore(idle_ttl=idle_ttl)
+        size = self.SLOT.size * slots
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+        # The segment outlives any single worker; don't let the exiting process unlink it
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(self._shm._name, 'shared_memory')
+
+        self._lock = threading.Lock()
+        self._lock_file = open(os.path.join(tempfile.gettempdir(), f"{name}.lock"), 'a+b')
+
+    def _key_hash(self, key):
+        # Zero marks an empty slot, so never hand it out as a hash
+        return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little') or 1
+
+    def _find_slot(self, key_hash, now=None, window=None):
+        """Return ``(index, fresh)`` for the key's slot, or ``(None, False)``.
+
+        With ``now``, a missing key claims the first empty or expired slot in
+        its probe window; a live slot belonging to another key is never taken.
+        """
+        buf = self._shm.buf
+        home = key_hash % self.slots
+        reusable = None
+        for probe in range(self.MAX_PROBES):
+            index = (home + probe) % self.slots
+            slot_hash, _, updated, slot_window, _, _ = self.SLOT.unpack_from(buf, index * self.SLOT.size)
+            if slot_hash == key_hash:
+                return index, False
+            if slot_hash == 0:
+                # Slots are never emptied, so the key cannot be further along
+                if reusable is None:
+                    reusable = index
+                break
+            if (reusable is None and now is not None
+                    and now - updated >= self.idle_ttl and slot_window != window):
+                reusable = index
+        if reusable is None or now is None:
+            return None, False
+        return reusable, True
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            if fcntl is not None:
+                fcntl.lockf(self._lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.lockf(self._lock_file, fcntl.LOCK_UN)
+
+    def take(self, key, rate, burst, cost, now, window, quota=None):
+        key_hash = self._key_hash(key)
+        buf = self._shm.buf
+        with self._locked():
+            index, fresh = self._find_slot(key_hash, now, window)
+            if index is None:
+                # Table is crowded around this key: limit it per process instead
+                return self._overflow.take(key, rate, burst, cost, now, window, quota)
+            offset = index * self.SLOT.size
+            if fresh:
+                tokens, updated, slot_window, allowed_units, rejected_units = burst, now, window, 0, 0
+            else:
+                _, tokens, updated, slot_window, allowed_units, rejected_units = self.SLOT.unpack_from(buf, offset)
+            if slot_window != window:
+                allowed_units = rejected_units = 0
+            tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+            within_quota = quota is None or allowed_units + cost <= quota
+            allowed = within_quota and tokens >= min(cost, burst)
+            if allowed:
+                tokens -= cost
+                allowed_units += cost
+            else:
+                rejected_units += cost
+            self.SLOT.pack_into(buf, offset, key_hash, tokens, now, window, allowed_units, rejected_units)
+            return allowed, tokens, allowed_units
+
+    def usage(self, key, window):
+        key_hash = self._key_hash(key)
+        with self._locked():
+            index, _ = self._find_slot(key_hash)
+            if index is None:
+                return self._overflow.usage(key, window)
+            _, _, _, slot_window, allowed, rejected = self.SLOT.unpack_from(self._shm.buf, index * self.SLOT.size)
+            if slot_window != window:
+                return {'allowed': 0, 'rejected': 0}
+            return {'allowed': allowed, 'rejected': rejected}
+
+
+class TokenBucketLimiter:
+    """Token-bucket rate limiter: ``rate`` requests per second with bursts up to ``burst``.
+
+    A request costing more than ``burst`` is let through once the bucket is
+    full and leaves it in debt, so large batches are charged in full without
+    becoming impossible to send. With ``quota``, each key may also spend at
+    most that many units per ``quota_window`` seconds (UTC-aligned, daily by
+    default). Quota counters are per worker unless the store is shared.
+    """
+
+    def __init__(self, rate, burst, store=None, quota=None, quota_window=QUOTA_WINDOW):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.store = store or InProcessBucketStore()
+        self.quota = quota or None
+        self.quota_window = quota_window
+
+    def _window(self, wall):
+        return int(wall // self.quota_window)
+
+    def check(self, key, cost=1):
+        wall = time.time()
+        window = self._window(wall)
+        allowed, tokens, used = self.store.take(
+            key, self.rate, self.burst, cost, time.monotonic(), window, self.quota
+        )
+        if allowed:
+            # Seconds until the bucket is full again
+            reset_after = (self.burst - tokens) / self.rate
+        elif self.quota is not None and used + cost > self.quota:
+            # Out of quota: nothing helps until the next window starts
+            reset_after = (window + 1) * self.quota_window - wall
+        else:
+            # Seconds until enough tokens have refilled for this request
+            reset_after = (min(cost, self.burst) - tokens) / self.rate
+        quota_remaining = max(0, self.quota - used) if self.quota is not None else None
+        return RateLimitResult(
+            allowed, int(self.burst), max(0, int(tokens)), math.ceil(reset_after), self.quota, quota_remaining
+        )
+
+    def usage(self, key):
+        """Units allowed and rejected for ``key`` in the current quota window"""
+        return self.store.usage(key, self._window(time.time()))
+
+
+def client_key():
+    """Rate-limit key for the current request: a configured API key if sent, client IP otherwise"""
+    api_key = request.headers.get('X-API-Key')
+    # Unknown keys are ignored, otherwise a client could rotate keys to dodge its limit
+    if api_key and api_key in current_app.config.get('RATE_LIMIT_API_KEYS', ()):
+        return f"key:{api_key}"
+    return f"ip:{request.remote_addr}"
+
+
+def init_rate_limiting(app, endpoints, costs=None):
+    """Apply a token-bucket limit and daily quota to the given endpoints, configured from the environment.
+
+    ``costs`` maps an endpoint to a function returning the number of tokens
+    the current request takes; other endpoints cost one token per request.
+    Behind reverse proxies, set RATE_LIMIT_TRUSTED_PROXIES to their count so
+    clients are keyed by the X-Forwarded-For address instead of the proxy's.
+    """
+    trusted_proxies = int(os.getenv('RATE_LIMIT_TRUSTED_PROXIES', '0'))
+    if trusted_proxies:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_proxies)
+    app.config.setdefault('RATE_LIMIT_API_KEYS', frozenset(
+        key.strip() for key in os.getenv('RATE_LIMIT_API_KEYS', '').split(',') if key.strip()
+    ))
+    shared_name = os.getenv('RATE_LIMIT_SHARED_MEMORY')
+    store = SharedMemoryBucketStore(shared_name) if shared_name else InProcessBucketStore()
+    limiter = TokenBucketLimiter(
+        rate=float(os.getenv('RATE_LIMIT_PER_SECOND', '5')),
+        burst=float(os.getenv('RATE_LIMIT_BURST', '20')),
+        store=store,
+        quota=int(os.getenv('RATE_LIMIT_DAILY_QUOTA', '0'))
+    )
+    limited_endpoints = set(endpoints)
+    endpoint_costs = dict(costs or {})
+
+    @app.before_request
+    def enforce_rate_limit():
+        if request.endpoint not in limited_endpoints or request.method == 'OPTIONS':
+            return None
+        cost_of = endpoint_costs.get(request.endpoint)
+        cost = cost_of() if cost_of else 1
+        result = limiter.check(client_key(), cost)
+        g.rate_limit = result
+        if not result.allowed:
+            if result.quota_remaining is not None and result.quota_remaining < cost:
+                return jsonify({'error': 'Daily quota exceeded. Please try again tomorrow.'}), 429
+            return jsonify({'error': 'Rate limit exceeded. Please slow down and try again shortly.'}), 429
+        return None
+
+    @app.after_request
+    def add_rate_limit_headers(response):
+        result = g.pop('rate_limit', None)
+        if result is not None:
+            response.headers['X-RateLimit-Limit'] = str(result.limit)
+            response.headers['X-RateLimit-Remaining'] = str(result.remaining)
+            response.headers['X-RateLimit-Reset'] = str(result.reset_after)
+            if result.quota is not None:
+                response.headers['X-Quota-Limit'] = str(result.quota)
+                response.headers['X-Quota-Remaining'] = str(result.quota_remaining)
+            if not result.allowed:
+                response.headers['Retry-After'] = str(result.reset_after)
+        return response
+
+    app.extensions['rate_limiter'] = limiter
+    return limiter
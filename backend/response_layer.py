@@ -0,0 +1,175 @@
+# backend/response_layer.py
+import gzip
+import hashlib
+import json
+import os
+
+from flask import render_template, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent as-is; compressing them costs more than it saves
+MIN_COMPRESS_SIZE = 1024
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider that uses orjson when installed and falls back to Flask's default"""
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if self.sort_keys else 0)
+            return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError as e:
+            # Re-raise as the stdlib error so request.get_json() reports a 400
+            raise json.JSONDecodeError(str(e), e.doc, e.pos) from e
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(self.dumps(obj), mimetype=self.mimetype)
+
+
+def choose_encoding(accept_encoding):
+    """Pick the best content coding we support from an Accept-Encoding header"""
+    offered = {}
+    for part in (accept_encoding or '').split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[token] = q
+
+    for encoding in ('br', 'gzip'):
+        if encoding == 'br' and brotli is None:
+            continue
+        if offered.get(encoding, offered.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress_body(body, encoding):
+    """Compress a response body with the given content coding"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def compress_response(response):
+    """after_request hook: compress large JSON/HTML bodies the client can decode"""
+    if (response.direct_passthrough
+            or response.status_code < 200 or response.status_code >= 300
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_SIZE:
+        return response
+
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+    if not encoding:
+        return response
+
+    response.set_data(compress_body(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+class TemplateCache:
+    """Renders static templates once and keeps identity/gzip/brotli copies in memory"""
+
+    def __init__(self, app):
+        self.app = app
+        self._entries = {}
+
+    def _source_mtime(self, path):
+        try:
+            return os.stat(path).st_mtime_ns if path else None
+        except OSError:
+            return None
+
+    def _build(self, template_name):
+        path = self.app.jinja_env.get_template(template_name).filename
+        body = render_template(template_name).encode('utf-8')
+        entry = {
+            'path': path,
+            'mtime': self._source_mtime(path),
+            'etag': hashlib.sha1(body).hexdigest(),
+            'identity': body,
+            'gzip': gzip.compress(body, compresslevel=9),
+        }
+        if brotli is not None:
+            entry['br'] = brotli.compress(body, quality=11)
+        return entry
+
+    def get(self, template_name):
+        entry = self._entries.get(template_name)
+        # In debug mode, rebuild only when the template file has been edited
+        if entry is None or (self.app.debug and self._source_mtime(entry['path']) != entry['mtime']):
+            entry = self._build(template_name)
+            self._entries[template_name] = entry
+        return entry
+
+    def serve(self, template_name):
+        """Return a cached, conditionally-validated response for a template"""
+        entry = self.get(template_name)
+        encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+        if encoding not in entry:
+            encoding = None
+
+        # Each representation gets its own strong ETag so caches never mix codings
+        etag = f"{entry['etag']}-{encoding}" if encoding else entry['etag']
+
+        response = self.app.response_class(mimetype='text/html')
+        response.set_etag(etag)
+        response.vary.add('Accept-Encoding')
+        response.cache_control.no_cache = True
+
+        if request.if_none_match.contains(etag):
+            response.status_code = 304
+            return response
+
+        if encoding:
+            response.set_data(entry[encoding])
+            response.headers['Content-Encoding'] = encoding
+        else:
+            response.set_data(entry['identity'])
+        return response
+
+
+def init_response_layer(app):
+    """Install the fast JSON provider, response compression and the template cache"""
+    app.json = FastJSONProvider(app)
+    app.after_request(compress_response)
+    app.extensions['template_cache'] = TemplateCache(app)
+    return app.extensions['template_cache']
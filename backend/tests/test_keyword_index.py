@@ -0,0 +1,91 @@
+# backend/tests/test_keyword_index.py
+import os
+import pickle
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hf_legal_analyzer import HFLegalAnalyzer
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return HFLegalAnalyzer()
+
+
+@pytest.fixture(scope='module')
+def index(analyzer):
+    return analyzer.keyword_index
+
+
+@pytest.mark.parametrize('token, expected', [
+    ('landlrod', 'landlord'),
+    ('desposit', 'deposit'),
+    ('overtiem', 'overtime'),
+    ('defectve', 'defective'),
+    ('harrassed', 'harass'),
+    ('evicted', 'eviction'),
+    ('employers', 'employer'),
+    ('casero', 'landlord'),
+    ('तलाक', 'divorce'),
+])
+def test_corrects_typos_inflections_and_translations(index, token, expected):
+    assert index.canonical_token(token) == expected
+
+
+@pytest.mark.parametrize('token', [
+    'hired', 'tired', 'wired', 'hacked', 'remote', 'workers', 'police', 'fined', 'filed', 'detective',
+    'painting', 'printing', 'patenting', 'overtake', 'overture', 'overtone', 'hosing', 'landlocked',
+])
+def test_leaves_real_words_alone(index, token):
+    assert index.canonical_token(token) == token
+
+
+def test_common_words_are_never_rewritten(index):
+    rewritten = {word for word in index.common_words if index.canonical_token(word) != word}
+    assert not rewritten
+
+
+@pytest.mark.parametrize('text, category, issue', [
+    ("My landlrod won't return my desposit", 'housing and landlord tenant law', 'security_deposit'),
+    ("Mi casero no me devuelve el deposito", 'housing and landlord tenant law', 'security_deposit'),
+    ("My boss refuses to pay overtiem", 'employment and labor law', 'wages'),
+    ("I bought a defectve phone", 'consumer protection law', 'defective_products'),
+])
+def test_classifies_noisy_inquiries(analyzer, text, category, issue):
+    result = analyzer.analyze_with_ai(text, explain=True)
+    assert result['category'] == category
+    assert result['explanation']['issue']['decision'] == issue
+
+
+@pytest.mark.parametrize('text', [
+    "Someone hacked my email",
+    "I got hired last month and love it",
+    "The police came to my house",
+    "A truck tried to overtake me and hit my car",
+])
+def test_real_words_do_not_trigger_employment(analyzer, text):
+    assert analyzer.analyze_with_ai(text)['category'] != 'employment and labor law'
+
+
+@pytest.mark.parametrize('text', [
+    "The printing shop lost my order",
+    "The painting I ordered arrived damaged",
+])
+def test_real_words_do_not_trigger_family_law(analyzer, text):
+    assert analyzer.analyze_with_ai(text)['category'] != 'family law and divorce'
+
+
+def test_tired_is_not_wrongful_termination(analyzer):
+    result = analyzer.analyze_with_ai("My employer makes me work when I am tired", explain=True)
+    assert result['explanation']['issue']['decision'] != 'wrongful_termination'
+
+
+def test_token_cache_is_per_instance_and_survives_pickling(index):
+    index.canonical_token('landlrod')
+    copy = pickle.loads(pickle.dumps(index))
+    assert copy._token_cache is not index._token_cache
+    assert copy._lexicon is None
+    assert copy.canonical_token('landlrod') == 'landlord'
@@ -0,0 +1,140 @@
+# backend/warm_start.py
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, suppress
+
+SNAPSHOT_MAGIC = b'RASNAP01'
+FINGERPRINT_SIZE = 40
+
+
+class StartupTimer:
+    """Collects a per-phase breakdown of how long startup took"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def as_dict(self):
+        return {
+            'phases_ms': {name: round(seconds * 1000, 2) for name, seconds in self.phases},
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 2)
+        }
+
+    def print_report(self):
+        report = self.as_dict()
+        print("⏱️  Startup breakdown:")
+        for name, ms in report['phases_ms'].items():
+            print(f"   {name:<24} {ms:>9.2f} ms")
+        print(f"   {'total':<24} {report['total_ms']:>9.2f} ms")
+
+
+SNAPSHOT_SOURCES = (
+    'hf_legal_analyzer.py',
+    'jurisdiction_rules.py',
+    'keyword_index.py',
+    os.path.join('data', 'jurisdictions.json'),
+    os.path.join('data', 'jurisdiction_rules.json'),
+    os.path.join('data', 'keyword_synonyms.json'),
+)
+
+
+def _fingerprint():
+    """Identify the analyzer code, rule data and interpreter a snapshot was built with"""
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha1(sys.version.encode('utf-8'))
+    for source in SNAPSHOT_SOURCES:
+        with open(os.path.join(backend_dir, source), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest().encode('ascii')
+
+
+def save_snapshot(analyzer, path):
+    """Serialize the warmed analyzer state to a snapshot file"""
+    payload = pickle.dumps(analyzer.export_state(), protocol=pickle.HIGHEST_PROTOCOL)
+    # Unique temp file per writer: several workers may miss the snapshot at once
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(_fingerprint())
+            f.write(payload)
+        # Atomic rename so workers booting concurrently never see a partial file
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+
+def load_snapshot(path):
+    """Read a snapshot file and return its state, or None if missing or stale"""
+    if not path or not os.path.exists(path):
+        return None
+
+    header_size = len(SNAPSHOT_MAGIC) + FINGERPRINT_SIZE
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            print(f"⚠️  Ignoring snapshot with unknown format: {path}")
+            return None
+        if data[len(SNAPSHOT_MAGIC):header_size] != _fingerprint():
+            print(f"⚠️  Ignoring stale snapshot: {path}")
+            return None
+        with memoryview(data) as view:
+            return pickle.loads(view[header_size:])
+    except (OSError, ValueError, pickle.UnpicklingError) as e:
+        print(f"⚠️  Could not load snapshot {path}: {e}")
+        return None
+
+
+def load_analyzer(snapshot_path=None, timer=None):
+    """Build the analyzer, warm-starting from a snapshot when one is available.
+
+    When ``snapshot_path`` is given but missing or stale, the freshly built
+    state is written there so the next worker can boot from it.
+    """
+    timer = timer or StartupTimer()
+
+    with timer.phase('import analyzer'):
+        from hf_legal_analyzer import HFLegalAnalyzer
+
+    state = None
+    if snapshot_path:
+        with timer.phase('load snapshot'):
+            state = load_snapshot(snapshot_path)
+
+    with timer.phase('build analyzer'):
+        analyzer = HFLegalAnalyzer(snapshot_state=state)
+
+    if snapshot_path and state is None:
+        with timer.phase('write snapshot'):
+            try:
+                save_snapshot(analyzer, snapshot_path)
+            except OSError as e:
+                print(f"⚠️  Could not write snapshot {snapshot_path}: {e}")
+
+    return analyzer
+
+
+if __name__ == "__main__":
+    # Usage: python warm_start.py [snapshot_path]
+    path = sys.argv[1] if len(sys.argv) > 1 else 'analyzer.snapshot'
+    timer = StartupTimer()
+    if os.path.exists(path):
+        os.remove(path)
+    load_analyzer(path, timer)
+    print(f"✅ Snapshot written to: {path}")
+    timer.print_report()